@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 
 import asyncio
-import dataclasses
 import json
 import os
 import traceback
@@ -14,6 +13,11 @@ from websockets.exceptions import ConnectionClosed
 from bot import Bot
 from game_message import TeamGameState
 
+# Built once and reused for every tick instead of setting up a decoder /
+# encoder on each msgspec.json.decode/encode call.
+decoder = msgspec.json.Decoder(TeamGameState)
+encoder = msgspec.json.Encoder()
+
 
 async def run():
     uri = "ws://127.0.0.1:8765"
@@ -41,7 +45,7 @@ async def game_loop(websocket: ClientConnection, bot: Bot):
             print("Websocket was closed.")
             break
 
-        game_message: TeamGameState = msgspec.json.decode(message, type=TeamGameState)
+        game_message: TeamGameState = decoder.decode(message)
 
         if game_message.lastTickErrors:
             print(
@@ -62,10 +66,11 @@ async def game_loop(websocket: ClientConnection, bot: Bot):
         payload = {
             "type": "COMMAND",
             "tick": game_message.tick,
-            "actions": [dataclasses.asdict(action) for action in actions],
+            # msgspec encodes the action dataclasses directly, no asdict copy
+            "actions": actions,
         }
 
-        await websocket.send(msgspec.json.encode(payload))
+        await websocket.send(encoder.encode(payload))
 
 
 if __name__ == "__main__":
@@ -1,8 +1,36 @@
+import heapq
 import random
+from operator import attrgetter, itemgetter
 from typing import Dict, List, Optional, Set, Tuple
 
 from game_message import *
 
+# Unit moves, shared instead of allocating a new Position per check.
+# Never mutate these.
+UP = Position(x=0, y=-1)
+DOWN = Position(x=0, y=1)
+LEFT = Position(x=-1, y=0)
+RIGHT = Position(x=1, y=0)
+
+# Order in which the whip sweeps across the map. The tables below are
+# indexed by the same position; the names are only used for logging.
+WHIP_ORDER = ("right", "down", "left", "up")
+WHIP_PRIMARY = (RIGHT, DOWN, LEFT, UP)
+WHIP_SIDES = ((UP, DOWN), (LEFT, RIGHT), (UP, DOWN), (LEFT, RIGHT))
+WHIP_BACK = (LEFT, UP, RIGHT, DOWN)
+# (sort key, reverse) so the spores furthest along the whip move first:
+# rightmost, bottommost, leftmost, topmost
+WHIP_SORT = (
+    (attrgetter("position.x"), True),
+    (attrgetter("position.y"), True),
+    (attrgetter("position.x"), False),
+    (attrgetter("position.y"), False),
+)
+
+# Per-spore / per-tile logging. Off by default: formatting and flushing
+# these lines every tick costs more than the decisions themselves.
+VERBOSE = False
+
 
 class Bot:
     def __init__(self):
@@ -10,21 +38,22 @@ class Bot:
         self.explored_tiles: Set[Tuple[int, int]] = set()
         # (x, y, nutrient_value)
         self.expansion_targets: List[Tuple[int, int, int]] = []
-        self.pending_actions: List[Action] = []  # Track actions from this tick
+        # (width, height) of the map expansion_targets was built from
+        self.analyzed_map_size: Optional[Tuple[int, int]] = None
         # Positions where spores will be spawned
         self.spawner_occupancy: Set[Tuple[int, int]] = set()
-        # spore_id -> (x, y) where it will move
-        self.spore_destinations: dict = {}
+        # (x, y) tiles spores are moving to this tick
+        self.reserved_tiles: Set[Tuple[int, int]] = set()
 
-        # Cache for expansion targets per spore
-        # spore_id -> (target_x, target_y, tick)
-        self.expansion_cache: dict = {}
-        self.cache_duration = 5  # How many ticks to keep cached target
+        self.combat_radius = 4  # Max Manhattan distance to chase an enemy
         self.spore_actions_taken: Set[str] = set()
-        self.spore_index_map: Dict[str, int] = {}
+        # spore_id -> 1-based index, built on first use by _spore_label
+        self.spore_index_map: Optional[Dict[str, int]] = None
+        self.labelled_spores: List[Spore] = []
 
         # 🔥 鞭子策略变量
-        self.whip_direction = "right"  # 当前鞭子挥动方向
+        self.whip_index = 0  # WHIP_ORDER 中的当前位置
+        self.whip_direction = WHIP_ORDER[0]  # 当前鞭子挥动方向
         self.whip_ticks = 0  # 当前方向已持续的tick数
         self.whip_duration = 35  # 每个方向持续的tick数
         self.max_spores = 30  # 最大孢子数
@@ -35,26 +64,24 @@ class Bot:
         try:
             print(f"\n=== TICK {game_message.tick} ===")
 
-            # Reset tracking for this tick
-            self.pending_actions = []
-            self.spawner_occupancy = set()
-            self.spore_destinations = {}
-            self.spore_actions_taken = set()
+            # Reset tracking for this tick (cleared in place, not reallocated)
+            self.spawner_occupancy.clear()
+            self.reserved_tiles.clear()
+            self.spore_actions_taken.clear()
 
             actions = []
             my_team: TeamInfo = game_message.world.teamInfos[game_message.yourTeamId]
             world = game_message.world
-            self.spore_index_map = {
-                spore.id: idx for idx, spore in enumerate(my_team.spores, start=1)
-            }
+            # Labels are only needed for logging, so index lazily
+            self.labelled_spores = my_team.spores
+            self.spore_index_map = None
 
             # 🔥 更新鞭子方向
             self.whip_ticks += 1
             if self.whip_ticks >= self.whip_duration:
                 self.whip_ticks = 0
-                directions = ["right", "down", "left", "up"]
-                current_idx = directions.index(self.whip_direction)
-                self.whip_direction = directions[(current_idx + 1) % 4]
+                self.whip_index = (self.whip_index + 1) % len(WHIP_ORDER)
+                self.whip_direction = WHIP_ORDER[self.whip_index]
                 print(f"🔥 鞭子转向: {self.whip_direction}")
 
             print(
@@ -72,9 +99,12 @@ class Bot:
                 print(
                     f"❌ ERRORS from last tick: {game_message.lastTickErrors}")
 
-            # Initialize expansion targets on first tick
-            if game_message.tick == 0:
+            # Initialize expansion targets once per map (the map never changes
+            # during a game, so this also covers joining after tick 0)
+            map_size = (world.map.width, world.map.height)
+            if self.analyzed_map_size != map_size:
                 self._analyze_map(world.map)
+                self.analyzed_map_size = map_size
                 print(
                     f"Analyzed map: found {len(self.expansion_targets)} valuable tiles")
 
@@ -118,32 +148,32 @@ class Bot:
             f"NutrientGrid dimensions: {len(game_map.nutrientGrid)} rows x {len(game_map.nutrientGrid[0]) if game_map.nutrientGrid else 0} cols")
 
         # Correct indexing: nutrientGrid[row][col] = nutrientGrid[y][x]
-        for y in range(len(game_map.nutrientGrid)):
-            for x in range(len(game_map.nutrientGrid[y])):
-                nutrient_value = game_map.nutrientGrid[y][x]
+        for y, row in enumerate(game_map.nutrientGrid):
+            for x, nutrient_value in enumerate(row):
                 if nutrient_value > 0:
                     self.expansion_targets.append((x, y, nutrient_value))
-                    if len(self.expansion_targets) <= 20:  # Debug first 20 tiles
+                    if VERBOSE and len(self.expansion_targets) <= 20:  # Debug first 20 tiles
                         print(f"  Tile ({x},{y}): {nutrient_value} nutrients")
 
-        # Sort by nutrient value (descending)
-        self.expansion_targets.sort(key=lambda t: t[2], reverse=True)
+        # Only the top tiles are reported, so skip sorting the whole list
+        top_tiles = heapq.nlargest(
+            10, self.expansion_targets, key=itemgetter(2))
         print(f"\nTop 10 highest-value tiles:")
-        for i, (x, y, val) in enumerate(self.expansion_targets[:10]):
+        for i, (x, y, val) in enumerate(top_tiles):
             print(f"  {i+1}. Position ({x},{y}): {val} nutrients")
         print(f"Total tiles with nutrients: {len(self.expansion_targets)}")
 
     def _get_nutrient_value(self, x: int, y: int, game_map: GameMap) -> int:
         """Safely get nutrient value at position. Grid is indexed as [y][x]."""
-        try:
-            if 0 <= y < len(game_map.nutrientGrid) and 0 <= x < len(game_map.nutrientGrid[y]):
-                value = game_map.nutrientGrid[y][x]
-                return value
-        except (IndexError, TypeError) as e:
-            print(f"      ERROR accessing nutrient at ({x},{y}): {e}")
+        if 0 <= x < game_map.width and 0 <= y < game_map.height:
+            return game_map.nutrientGrid[y][x]
         return 0
 
     def _spore_label(self, spore: Spore) -> str:
+        if self.spore_index_map is None:
+            self.spore_index_map = {
+                s.id: idx for idx, s in enumerate(self.labelled_spores, start=1)
+            }
         idx = self.spore_index_map.get(spore.id)
         return f"Spore #{idx}" if idx is not None else "Spore"
 
@@ -174,35 +204,46 @@ class Bot:
 
         try:
             available_nutrients = my_team.nutrients
+            desired_biomass = 15  # Fixed biomass size
+
+            # Can't afford a single spore: skip indexing tiles and spawners
+            if available_nutrients < desired_biomass:
+                if VERBOSE:
+                    print(
+                        f"  ✗ Not enough nutrients (have {available_nutrients}, need {desired_biomass})")
+                return actions
+
+            # (x, y) -> first of our spores on that tile
+            spores_by_tile: Dict[Tuple[int, int], Spore] = {}
+            for spore in my_team.spores:
+                spores_by_tile.setdefault(
+                    (spore.position.x, spore.position.y), spore)
 
             for spawner in my_team.spawners:
-                print(
-                    f"  Spawner {spawner.id} at ({spawner.position.x}, {spawner.position.y})")
+                spawner_pos = (spawner.position.x, spawner.position.y)
+                if VERBOSE:
+                    print(f"  Spawner {spawner.id} at {spawner_pos}")
 
                 # Check if there's already a spore at spawner location (from game state)
-                spore_at_spawner = None
-                for spore in my_team.spores:
-                    if spore.position.x == spawner.position.x and spore.position.y == spawner.position.y:
-                        spore_at_spawner = spore
-                        break
+                spore_at_spawner = spores_by_tile.get(spawner_pos)
 
                 if spore_at_spawner:
-                    label = self._spore_label(spore_at_spawner)
-                    print(
-                        f"    {label} already at spawner (biomass: {spore_at_spawner.biomass})")
+                    if VERBOSE:
+                        label = self._spore_label(spore_at_spawner)
+                        print(
+                            f"    {label} already at spawner (biomass: {spore_at_spawner.biomass})")
                     continue
 
                 # Check if we're about to spawn a spore here in this tick (from pending actions)
-                spawner_pos = (spawner.position.x, spawner.position.y)
                 if spawner_pos in self.spawner_occupancy:
-                    print(f"    Already producing at this spawner this tick")
+                    if VERBOSE:
+                        print(f"    Already producing at this spawner this tick")
                     continue
 
-                desired_biomass = 15  # Fixed biomass size
-
                 if available_nutrients >= desired_biomass:
-                    print(
-                        f"    ✓ Producing spore with biomass {desired_biomass}")
+                    if VERBOSE:
+                        print(
+                            f"    ✓ Producing spore with biomass {desired_biomass}")
                     action = SpawnerProduceSporeAction(
                         spawnerId=spawner.id,
                         biomass=desired_biomass
@@ -211,9 +252,10 @@ class Bot:
                     # Mark as occupied for this tick
                     self.spawner_occupancy.add(spawner_pos)
                     available_nutrients -= desired_biomass  # Track locally
-            else:
-                print(
-                    f"    ✗ Not enough nutrients (have {available_nutrients}, need {desired_biomass})")
+                else:
+                    if VERBOSE:
+                        print(
+                            f"    ✗ Not enough nutrients (have {available_nutrients}, need {desired_biomass})")
 
         except Exception as e:
             print(f"💥 ERROR in _manage_spawners: {e}")
@@ -227,74 +269,102 @@ class Bot:
         actions = []
 
         try:
-            enemy_positions = self._get_enemy_positions(world, my_team.teamId)
-            neutral_positions = self._get_neutral_positions(world)
+            enemy_positions, neutral_positions = self._get_other_spores(
+                world, my_team.teamId)
 
-            print(f"  Managing {len(my_team.spores)} spores")
-            print(
-                f"  Detected {len(enemy_positions)} enemy spores, {len(neutral_positions)} neutral spores")
+            if VERBOSE:
+                print(f"  Managing {len(my_team.spores)} spores")
+                print(
+                    f"  Detected {len(enemy_positions)} enemy spores, {len(neutral_positions)} neutral spores")
+            enemy_buckets = self._bucket_enemies(enemy_positions)
+            # A spore that can't beat the weakest enemy can't win any fight,
+            # so it skips the bucket scan altogether
+            weakest_enemy = min(
+                (biomass for _, biomass, _ in enemy_positions), default=0)
+            neutrals_by_tile = self._index_neutrals(neutral_positions)
+            weakest_neutral = min(
+                (biomass for _, biomass in neutral_positions), default=0)
+
+            team_can_build = self._team_can_build_spawner(my_team)
+
+            # Same for every spore this tick: map bounds and the grids whip
+            # moves are checked against
+            map_width, map_height = world.map.width, world.map.height
+            ownership_grid = world.ownershipGrid
+            biomass_grid = world.biomassGrid
+
+            # Filter once up front: spores with too little biomass or that
+            # already acted this tick are never sorted or examined
+            actionable_spores = [
+                spore for spore in my_team.spores
+                if spore.biomass >= 2 and spore.id not in self.spore_actions_taken
+            ]
 
             # 🔥 按鞭子方向排序孢子
-            sorted_spores = self._sort_spores_for_whip(my_team.spores)
+            sorted_spores = self._sort_spores_for_whip(actionable_spores)
 
-            print("  Total spores: ", len(sorted_spores))
+            if VERBOSE:
+                print(
+                    f"  Total spores: {len(my_team.spores)}, actionable: {len(sorted_spores)}")
             for idx, spore in enumerate(sorted_spores, start=1):
                 try:
                     label = f"Spore #{idx}"
-                    is_leader = (idx <= 5)  # 前5个是领头的
 
-                    if idx <= 5:
+                    if VERBOSE and idx <= 5:
                         print(
                             f"  {label} at ({spore.position.x}, {spore.position.y}), biomass: {spore.biomass}")
-                    if spore.id in self.spore_actions_taken:
-                        continue
-
-                    # Skip spores with insufficient biomass
-                    if spore.biomass < 2:
-                        print(
-                            f"    ✗ {label} insufficient biomass ({spore.biomass} < 2)")
-                        continue
 
                     # Decision 1: Create spawner?
-                    if self._should_create_spawner(spore, my_team, world, game_message):
-                        print(f"    ✓ {label} creating spawner")
+                    if team_can_build and self._should_create_spawner(spore, my_team, world, game_message):
+                        if VERBOSE:
+                            print(f"    ✓ {label} creating spawner")
                         actions.append(
                             SporeCreateSpawnerAction(sporeId=spore.id))
                         self.spore_actions_taken.add(spore.id)
                         continue
 
                     # Decision 2: Combat with enemies?
-                    enemy_action = self._handle_combat(
-                        spore, enemy_positions, world)
+                    enemy_action = None
+                    if enemy_buckets and spore.biomass > weakest_enemy + 3:
+                        enemy_action = self._handle_combat(
+                            spore, enemy_buckets)
                     if enemy_action:
-                        print(f"    ✓ {label} engaging enemy")
+                        if VERBOSE:
+                            print(f"    ✓ {label} engaging enemy")
                         actions.append(enemy_action)
                         self.spore_actions_taken.add(spore.id)
                         continue
 
                     # Decision 3: Attack weak neutrals if nearby?
-                    neutral_action = self._handle_neutrals(
-                        spore, neutral_positions, world)
+                    neutral_action = None
+                    if neutrals_by_tile and spore.biomass > weakest_neutral + 50:
+                        neutral_action = self._handle_neutrals(
+                            spore, neutrals_by_tile)
                     if neutral_action:
-                        print(f"    ✓ {label} attacking neutral spore")
+                        if VERBOSE:
+                            print(f"    ✓ {label} attacking neutral spore")
                         actions.append(neutral_action)
                         self.spore_actions_taken.add(spore.id)
                         continue
 
                     # Decision 4: 🔥 鞭子式扩张
                     whip_move = self._get_whip_move(
-                        spore, world, my_team, is_leader)
+                        spore, my_team.teamId, map_width, map_height,
+                        ownership_grid, biomass_grid)
                     if whip_move:
-                        role = "领头" if is_leader else "跟随"
                         new_x = spore.position.x + whip_move.x
                         new_y = spore.position.y + whip_move.y
-                        print(f"    🔥 {label} ({role}) -> ({new_x}, {new_y})")
+                        if VERBOSE:
+                            is_leader = (idx <= 5)  # 前5个是领头的
+                            role = "领头" if is_leader else "跟随"
+                            print(f"    🔥 {label} ({role}) -> ({new_x}, {new_y})")
                         actions.append(SporeMoveAction(
                             sporeId=spore.id, direction=whip_move))
                         self.spore_actions_taken.add(spore.id)
-                        self.spore_destinations[spore.id] = (new_x, new_y)
+                        self.reserved_tiles.add((new_x, new_y))
                     else:
-                        print(f"    ✗ {label} has no valid expansion action")
+                        if VERBOSE:
+                            print(f"    ✗ {label} has no valid expansion action")
 
                 except Exception as e:
                     print(f"    💥 ERROR processing {label}: {e}")
@@ -309,36 +379,47 @@ class Bot:
 
     def _should_create_spawner(self, spore: Spore, my_team: TeamInfo,
                                world: GameWorld, game_message: TeamGameState) -> bool:
-        """Determine if a spore should create a spawner."""
+        """Determine if a spore should create a spawner.
+
+        Team-wide limits are checked once per tick by _team_can_build_spawner.
+        """
         # Need enough biomass
         if spore.biomass < my_team.nextSpawnerCost:
-            print(
-                f"      Not enough biomass for spawner (have {spore.biomass}, need {my_team.nextSpawnerCost})")
+            if VERBOSE:
+                print(
+                    f"      Not enough biomass for spawner (have {spore.biomass}, need {my_team.nextSpawnerCost})")
             return False
 
+        # Check if far enough from other spawners (5 tiles minimum)
+        if not self._is_good_spawner_location(spore.position, my_team.spawners):
+            if VERBOSE:
+                print(f"      Too close to existing spawner")
+            return False
+
+        if VERBOSE:
+            # Get nutrient value at current position
+            nutrient_value = self._get_nutrient_value(
+                spore.position.x, spore.position.y, world.map)
+            print(
+                f"      ✓ Good spawner location at ({spore.position.x},{spore.position.y}): nutrient={nutrient_value}, cost={my_team.nextSpawnerCost}, team_nutrients={my_team.nutrients}")
+        return True
+
+    def _team_can_build_spawner(self, my_team: TeamInfo) -> bool:
+        """Check the spawner limits that don't depend on which spore builds."""
         # Don't create too many spawners
         if len(my_team.spawners) >= 10:
-            print(
-                f"      Already have {len(my_team.spawners)} spawners (max 10)")
+            if VERBOSE:
+                print(
+                    f"  Already have {len(my_team.spawners)} spawners (max 10)")
             return False
 
         # Check if we have enough nutrients accumulated (economic readiness)
         if my_team.nutrients < 100:
-            print(
-                f"      Not enough nutrients yet ({my_team.nutrients} < 100) to justify new spawner")
-            return False
-
-        # Check if far enough from other spawners (5 tiles minimum)
-        if not self._is_good_spawner_location(spore.position, my_team.spawners):
-            print(f"      Too close to existing spawner")
+            if VERBOSE:
+                print(
+                    f"  Not enough nutrients yet ({my_team.nutrients} < 100) to justify new spawner")
             return False
 
-        # Get nutrient value at current position
-        nutrient_value = self._get_nutrient_value(
-            spore.position.x, spore.position.y, world.map)
-
-        print(
-            f"      ✓ Good spawner location at ({spore.position.x},{spore.position.y}): nutrient={nutrient_value}, cost={my_team.nextSpawnerCost}, team_nutrients={my_team.nutrients}")
         return True
 
     def _is_good_spawner_location(self, position: Position, spawners: List[Spawner]) -> bool:
@@ -351,305 +432,161 @@ class Bot:
                 return False
         return True
 
-    def _handle_neutrals(self, spore: Spore, neutral_positions: List[Tuple[Position, int]],
-                         world: GameWorld) -> Optional[Action]:
-        """Attack neutral spores if we can win easily."""
-        for neutral_pos, neutral_biomass in neutral_positions:
-            distance = abs(spore.position.x - neutral_pos.x) + \
-                abs(spore.position.y - neutral_pos.y)
-
-            # Only attack if we're much stronger and it's close
-            if distance <= 1 and spore.biomass > neutral_biomass + 50:
-                print(
-                    f"      ✓ Attacking neutral at distance {distance} (our {spore.biomass} vs their {neutral_biomass})")
-                self.spore_destinations[spore.id] = (
-                    neutral_pos.x, neutral_pos.y)
-                return SporeMoveToAction(sporeId=spore.id, position=neutral_pos)
-
-        return None
-        """Check if position is far enough from other spawners."""
-        min_distance = 8
+    def _index_neutrals(self, neutral_positions: List[Tuple[Position, int]]) -> Dict[Tuple[int, int], list]:
+        """Group neutral spores by tile, keeping their list order within each tile."""
+        by_tile: Dict[Tuple[int, int], list] = {}
+        for order, (neutral_pos, neutral_biomass) in enumerate(neutral_positions):
+            key = (neutral_pos.x, neutral_pos.y)
+            entry = (order, neutral_pos, neutral_biomass)
+            tile = by_tile.get(key)
+            if tile is None:
+                by_tile[key] = [entry]
+            else:
+                tile.append(entry)
+        return by_tile
 
-        for spawner in spawners:
-            distance = abs(position.x - spawner.position.x) + \
-                abs(position.y - spawner.position.y)
-            if distance < min_distance:
-                print(
-                    f"        Distance to spawner at ({spawner.position.x}, {spawner.position.y}): {distance} < {min_distance}")
-                return False
-        return True
+    def _handle_neutrals(self, spore: Spore,
+                         neutrals_by_tile: Dict[Tuple[int, int], list]) -> Optional[Action]:
+        """Attack neutral spores if we can win easily."""
+        x, y = spore.position.x, spore.position.y
+        biomass = spore.biomass
+        best = None
+        # Only the spore's own tile and its 4 neighbours are close enough
+        for tile in ((x, y), (x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            for entry in neutrals_by_tile.get(tile, ()):
+                # Tiles are in list order, so the rest of this one comes
+                # after the current best
+                if best is not None and entry[0] > best[0]:
+                    break
+
+                # Only attack if we're much stronger; keep the earliest
+                # neutral in list order, as the full scan used to
+                if biomass > entry[2] + 50:
+                    best = entry
+                    break
+
+        if best is None:
+            return None
+
+        _, neutral_pos, neutral_biomass = best
+        distance = abs(x - neutral_pos.x) + abs(y - neutral_pos.y)
+        if VERBOSE:
+            print(
+                f"      ✓ Attacking neutral at distance {distance} (our {spore.biomass} vs their {neutral_biomass})")
+        self.reserved_tiles.add((neutral_pos.x, neutral_pos.y))
+        return SporeMoveToAction(sporeId=spore.id, position=neutral_pos)
 
-    def _get_enemy_positions(self, world: GameWorld, my_team_id: str) -> List[Tuple[Position, int, str]]:
-        """Get all enemy spore positions (excluding neutral spores)."""
+    def _get_other_spores(self, world: GameWorld, my_team_id: str) -> Tuple[List[Tuple[Position, int, str]], List[Tuple[Position, int]]]:
+        """Split non-friendly spores into enemy players and neutrals in one pass."""
         enemies = []
-        neutral_team_id = world.teamInfos.get(list(world.teamInfos.keys())[
-                                              0]).teamId if world.teamInfos else None
+        neutrals = []
 
-        # Find the actual neutral team ID from constants if available
+        # Enemies skip the first team in teamInfos unless the world carries
+        # the real neutral team ID; neutrals are only known from the latter
+        skip_team_id = world.teamInfos.get(list(world.teamInfos.keys())[
+                                           0]).teamId if world.teamInfos else None
+        neutral_team_id = None
         try:
             if hasattr(world, 'constants'):
-                neutral_team_id = world.constants.neutralTeamId
+                neutral_team_id = skip_team_id = world.constants.neutralTeamId
         except:
             pass
 
         for spore in world.spores:
+            team_id = spore.teamId
+            # Neutral spores don't move or attack
+            if neutral_team_id and team_id == neutral_team_id:
+                neutrals.append((spore.position, spore.biomass))
+                continue
+
             # Skip our own spores
-            if spore.teamId == my_team_id or spore.teamId == "":
+            if team_id == my_team_id or team_id == "":
                 continue
 
-            # Skip neutral spores - they don't move or attack
-            if neutral_team_id and spore.teamId == neutral_team_id:
+            if skip_team_id and team_id == skip_team_id:
                 continue
 
             # This is an actual enemy player spore
-            enemies.append((spore.position, spore.biomass, spore.teamId))
-
-        return enemies
-
-    def _get_neutral_positions(self, world: GameWorld) -> List[Tuple[Position, int]]:
-        """Get all neutral spore positions."""
-        neutrals = []
-        neutral_team_id = None
-
-        # Find the actual neutral team ID
-        try:
-            if hasattr(world, 'constants'):
-                neutral_team_id = world.constants.neutralTeamId
-        except:
-            pass
-
-        if not neutral_team_id:
-            return neutrals
-
-        for spore in world.spores:
-            if spore.teamId == neutral_team_id:
-                neutrals.append((spore.position, spore.biomass))
-
-        return neutrals
-
-    def _handle_combat(self, spore: Spore, enemy_positions: List[Tuple[Position, int, str]],
-                       world: GameWorld) -> Optional[Action]:
-        """Engage enemy players if advantageous (not neutrals)."""
-        for enemy_pos, enemy_biomass, enemy_team in enemy_positions:
-            distance = abs(spore.position.x - enemy_pos.x) + \
-                abs(spore.position.y - enemy_pos.y)
-
-            # Attack if close and we're stronger
-            if distance <= 4 and spore.biomass > enemy_biomass + 3:
-                print(
-                    f"      ✓ Attacking enemy at distance {distance} (our {spore.biomass} vs their {enemy_biomass})")
-                self.spore_destinations[spore.id] = (enemy_pos.x, enemy_pos.y)
-                return SporeMoveToAction(sporeId=spore.id, position=enemy_pos)
-
-        return None
-
-    def _expand_territory(self, spore: Spore, world: GameWorld,
-                          my_team: TeamInfo, game_message: TeamGameState) -> Optional[Action]:
-        """Expand to unclaimed or high-value territory - prefer SporeMoveToAction."""
-        # Find best nearby target (with caching)
-        best_target = self._find_best_expansion_target(
-            spore, world, my_team.teamId, game_message.tick)
-
-        if best_target:
-            target_pos = Position(x=best_target[0], y=best_target[1])
-
-            # Check if this target is already being targeted by another spore this tick
-            if (best_target[0], best_target[1]) in self.spore_destinations.values():
-                print(
-                    f"      Target ({best_target[0]}, {best_target[1]}) already targeted by another spore")
-                # Clear cache and try random move
-                if spore.id in self.expansion_cache:
-                    del self.expansion_cache[spore.id]
-                return self._random_valid_move(spore, world)
-
-            # Always use SporeMoveToAction - it finds optimal path automatically
-            print(f"      Moving to target ({target_pos.x}, {target_pos.y})")
-            self.spore_destinations[spore.id] = (target_pos.x, target_pos.y)
-            return SporeMoveToAction(sporeId=spore.id, position=target_pos)
-
-        # Fallback: move in a valid cardinal direction
-        return self._random_valid_move(spore, world)
-
-    def _get_next_step_towards(self, current: Position, target: Position, world: GameWorld) -> Optional[Tuple[int, int]]:
-        """Calculate next step towards target (cardinal directions only)."""
-        dx = target.x - current.x
-        dy = target.y - current.y
-
-        # Prioritize moving in the direction with larger distance
-        if abs(dx) > abs(dy):
-            # Move horizontally
-            if dx > 0:
-                return (current.x + 1, current.y)
-            else:
-                return (current.x - 1, current.y)
-        elif dy != 0:
-            # Move vertically
-            if dy > 0:
-                return (current.x, current.y + 1)
+            enemies.append((spore.position, spore.biomass, team_id))
+
+        return enemies, neutrals
+
+    def _bucket_enemies(self, enemy_positions: List[Tuple[Position, int, str]]) -> Dict[Tuple[int, int], list]:
+        """Group enemies into combat_radius-sized cells so a spore only checks nearby ones."""
+        size = self.combat_radius
+        buckets: Dict[Tuple[int, int], list] = {}
+        for order, (enemy_pos, enemy_biomass, enemy_team) in enumerate(enemy_positions):
+            key = (enemy_pos.x // size, enemy_pos.y // size)
+            entry = (order, enemy_pos, enemy_biomass, enemy_team)
+            # setdefault(key, []) would build a throwaway list per enemy
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [entry]
             else:
-                return (current.x, current.y - 1)
-
-        return None
-
-    def _random_valid_move(self, spore: Spore, world: GameWorld) -> Optional[Action]:
-        """Generate a random valid move in cardinal directions, avoiding conflicts."""
-        directions = [
-            Position(x=0, y=-1),  # up
-            Position(x=0, y=1),   # down
-            Position(x=-1, y=0),  # left
-            Position(x=1, y=0),   # right
-        ]
-
-        valid_directions = []
-        for direction in directions:
-            new_x = spore.position.x + direction.x
-            new_y = spore.position.y + direction.y
-
-            # Check bounds
-            if 0 <= new_x < world.map.width and 0 <= new_y < world.map.height:
-                # Check if another spore is already moving here this tick
-                if (new_x, new_y) not in self.spore_destinations.values():
-                    valid_directions.append(direction)
-
-        if valid_directions:
-            chosen = random.choice(valid_directions)
-            new_x = spore.position.x + chosen.x
-            new_y = spore.position.y + chosen.y
-            self.spore_destinations[spore.id] = (new_x, new_y)
-            return SporeMoveAction(sporeId=spore.id, direction=chosen)
-
-        return None
-
-    def _find_best_expansion_target(self, spore: Spore, world: GameWorld,
-                                    my_team_id: str, current_tick: int) -> Optional[Tuple[int, int]]:
-        """Find best nearby uncontrolled tile - with caching."""
-
-        # Check cache first
-        if spore.id in self.expansion_cache:
-            cached_target, cached_tick = self.expansion_cache[spore.id]
-            if current_tick - cached_tick < self.cache_duration:
-                # Verify cached target is still valid
-                target_x, target_y = cached_target
-                owner = world.ownershipGrid[target_y][target_x]
-                biomass = world.biomassGrid[target_y][target_x]
-
-                # If we've claimed it, clear cache
-                if owner == my_team_id and biomass > 0:
-                    print(
-                        f"      Cached target ({target_x},{target_y}) now controlled, finding new target")
-                    del self.expansion_cache[spore.id]
-                else:
-                    print(
-                        f"      Using cached target: ({target_x},{target_y})")
-                    return cached_target
-
-        search_radius = 50
-        print(
-            f"      Searching for expansion target from ({spore.position.x}, {spore.position.y})")
-
-        # Build list of candidates
-        candidates = []
-        checked_count = 0
-
-        for dx in range(-search_radius, search_radius + 1):
-            for dy in range(-search_radius, search_radius + 1):
-                target_x = spore.position.x + dx
-                target_y = spore.position.y + dy
-
-                # Check bounds
-                if not (0 <= target_x < world.map.width and 0 <= target_y < world.map.height):
-                    continue
-
-                # Calculate Manhattan distance
-                distance = abs(dx) + abs(dy)
-                if distance == 0 or distance > search_radius:
-                    continue
-
-                checked_count += 1
-
-                # Get tile info
-                owner = world.ownershipGrid[target_y][target_x]
-                biomass_on_tile = world.biomassGrid[target_y][target_x]
-
-                # Skip tiles we already control
-                if owner == my_team_id and biomass_on_tile > 0:
-                    continue
-
-                # Skip tiles already targeted this tick
-                if (target_x, target_y) in self.spore_destinations.values():
-                    continue
-
-                # Get nutrient value
-                nutrient_value = self._get_nutrient_value(
-                    target_x, target_y, world.map)
-
-                # Only consider tiles with some value
-                if nutrient_value <= 0:
-                    continue
-
-                # Calculate score
-                score = nutrient_value * 10.0 / (distance + 1)
+                bucket.append(entry)
+        return buckets
 
-                # Bonus for uncontrolled tiles
-                if owner != my_team_id or biomass_on_tile == 0:
-                    score *= 2000.0
-
-                candidates.append((target_x, target_y, score,
-                                  nutrient_value, distance, owner))
-
-        print(
-            f"      Checked {checked_count} tiles, found {len(candidates)} candidates")
-
-        # Pick best candidate
-        if candidates:
-            candidates.sort(key=lambda x: x[2], reverse=True)
-
-            # Show top 3 candidates
-            print(f"      Top 3 candidates:")
-            for i, (x, y, score, nut, dist, owner) in enumerate(candidates[:3]):
-                print(
-                    f"        {i+1}. ({x},{y}): nutrient={nut}, dist={dist}, score={score:.1f}, owner={owner}")
-
-            best = candidates[0]
-            best_target = (best[0], best[1])
+    def _handle_combat(self, spore: Spore,
+                       enemy_buckets: Dict[Tuple[int, int], list]) -> Optional[Action]:
+        """Engage enemy players if advantageous (not neutrals)."""
+        size = self.combat_radius
+        sx, sy = spore.position.x, spore.position.y
+        biomass = spore.biomass
+        bx = sx // size
+        by = sy // size
+        best = None
+        # Any enemy within combat_radius lies in one of the 3x3 surrounding cells
+        for cx in (bx - 1, bx, bx + 1):
+            for cy in (by - 1, by, by + 1):
+                for entry in enemy_buckets.get((cx, cy), ()):
+                    order, enemy_pos, enemy_biomass, enemy_team = entry
+                    # Buckets are filled in list order, so the rest of this
+                    # one comes after the current best
+                    if best is not None and order > best[0]:
+                        break
+                    distance = abs(sx - enemy_pos.x) + abs(sy - enemy_pos.y)
 
-            # Cache the result
-            self.expansion_cache[spore.id] = (best_target, current_tick)
+                    # Attack if close and we're stronger; keep the earliest
+                    # enemy in list order, as the full scan used to
+                    if distance <= size and biomass > enemy_biomass + 3:
+                        best = entry
+                        break
 
-            return best_target
+        if best is None:
+            return None
 
-        print(f"      No valid expansion target found")
-        return None
+        _, enemy_pos, enemy_biomass, _ = best
+        distance = abs(sx - enemy_pos.x) + abs(sy - enemy_pos.y)
+        if VERBOSE:
+            print(
+                f"      ✓ Attacking enemy at distance {distance} (our {spore.biomass} vs their {enemy_biomass})")
+        self.reserved_tiles.add((enemy_pos.x, enemy_pos.y))
+        return SporeMoveToAction(sporeId=spore.id, position=enemy_pos)
 
     def _sort_spores_for_whip(self, spores: List[Spore]) -> List[Spore]:
         """按照鞭子方向排序孢子，形成链条。"""
         if not spores:
             return []
 
-        # 根据当前鞭子方向排序
-        if self.whip_direction == "right":
-            # 最右边的先动
-            return sorted(spores, key=lambda s: s.position.x, reverse=True)
-        elif self.whip_direction == "down":
-            # 最下方的先动
-            return sorted(spores, key=lambda s: s.position.y, reverse=True)
-        elif self.whip_direction == "left":
-            # 最左边的先动
-            return sorted(spores, key=lambda s: s.position.x)
-        else:  # up
-            # 最上方的先动
-            return sorted(spores, key=lambda s: s.position.y)
-
-    def _get_whip_move(self, spore: Spore, world: GameWorld, my_team: TeamInfo, is_leader: bool) -> Optional[Position]:
-        """获取鞭子式移动方向。"""
+        # 根据当前鞭子方向排序，最前端的先动
+        key, reverse = WHIP_SORT[self.whip_index]
+        return sorted(spores, key=key, reverse=reverse)
+
+    def _get_whip_move(self, spore: Spore, my_team_id: str, width: int, height: int,
+                       ownership_grid: List[List[str]], biomass_grid: List[List[int]]) -> Optional[Position]:
+        """获取鞭子式移动方向。地图尺寸和网格每个tick取一次后传入。"""
+        sx, sy = spore.position.x, spore.position.y
+        biomass = spore.biomass
+
         # 主要方向
         primary_dir = self._get_whip_primary_direction()
 
         # 尝试主方向
-        nx = spore.position.x + primary_dir.x
-        ny = spore.position.y + primary_dir.y
+        nx = sx + primary_dir.x
+        ny = sy + primary_dir.y
 
-        if self._is_valid_move(nx, ny, spore, world, my_team.teamId):
+        if self._is_valid_move(nx, ny, biomass, my_team_id,
+                               width, height, ownership_grid, biomass_grid):
             return primary_dir
 
         # 如果主方向不行，尝试侧向扩散
@@ -657,67 +594,53 @@ class Bot:
         random.shuffle(side_dirs)
 
         for side_dir in side_dirs:
-            nx = spore.position.x + side_dir.x
-            ny = spore.position.y + side_dir.y
+            nx = sx + side_dir.x
+            ny = sy + side_dir.y
 
-            if self._is_valid_move(nx, ny, spore, world, my_team.teamId):
+            if self._is_valid_move(nx, ny, biomass, my_team_id,
+                                   width, height, ownership_grid, biomass_grid):
                 return side_dir
 
-        # 最后尝试任意方向
-        all_dirs = [
-            Position(x=0, y=-1), Position(x=0, y=1),
-            Position(x=-1, y=0), Position(x=1, y=0)
-        ]
-        random.shuffle(all_dirs)
+        # 主方向和侧向都已检查过，只剩反方向
+        back_dir = WHIP_BACK[self.whip_index]
+        nx = sx + back_dir.x
+        ny = sy + back_dir.y
 
-        for direction in all_dirs:
-            nx = spore.position.x + direction.x
-            ny = spore.position.y + direction.y
-
-            if self._is_valid_move(nx, ny, spore, world, my_team.teamId):
-                return direction
+        if self._is_valid_move(nx, ny, biomass, my_team_id,
+                               width, height, ownership_grid, biomass_grid):
+            return back_dir
 
         return None
 
     def _get_whip_primary_direction(self) -> Position:
         """获取鞭子主方向。"""
-        if self.whip_direction == "right":
-            return Position(x=1, y=0)
-        elif self.whip_direction == "down":
-            return Position(x=0, y=1)
-        elif self.whip_direction == "left":
-            return Position(x=-1, y=0)
-        else:  # up
-            return Position(x=0, y=-1)
+        return WHIP_PRIMARY[self.whip_index]
 
     def _get_whip_side_directions(self) -> List[Position]:
         """获取鞭子侧向方向。"""
-        if self.whip_direction in ["right", "left"]:
-            # 水平移动时，侧向是上下
-            return [Position(x=0, y=-1), Position(x=0, y=1)]
-        else:
-            # 垂直移动时，侧向是左右
-            return [Position(x=-1, y=0), Position(x=1, y=0)]
-
-    def _is_valid_move(self, nx: int, ny: int, spore: Spore, world: GameWorld, my_team_id: str) -> bool:
+        # 水平移动时侧向是上下，垂直移动时侧向是左右
+        return list(WHIP_SIDES[self.whip_index])
+
+    def _is_valid_move(self, nx: int, ny: int, spore_biomass: int, my_team_id: str,
+                       width: int, height: int,
+                       ownership_grid: List[List[str]], biomass_grid: List[List[int]]) -> bool:
         """检查移动是否有效。"""
         # 检查边界
-        if not (0 <= nx < world.map.width and 0 <= ny < world.map.height):
+        if not (0 <= nx < width and 0 <= ny < height):
             return False
 
         # 检查是否已被占用
-        if (nx, ny) in self.spore_destinations.values():
+        if (nx, ny) in self.reserved_tiles:
             return False
 
-        owner = world.ownershipGrid[ny][nx]
-        biomass = world.biomassGrid[ny][nx]
+        owner = ownership_grid[ny][nx]
 
         # 可以移动到空地或自己的领地
         if owner == "" or owner == my_team_id:
             return True
 
         # 可以攻击较弱的敌人
-        if spore.biomass > biomass + 3:
+        if spore_biomass > biomass_grid[ny][nx] + 3:
             return True
 
         return False
@@ -116,10 +116,12 @@ class TeamGameState:
 
 
 class Action:
+    __slots__ = ()
+
     type: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SporeMoveAction(Action):
     """Move the spore one tile in the specified direction. Leaves biomass trail on empty tiles."""
 
@@ -130,7 +132,7 @@ class SporeMoveAction(Action):
     type: str = "SPORE_MOVE"
 
 
-@dataclass
+@dataclass(slots=True)
 class SporeMoveToAction(Action):
     """Move the spore towards the specified position using pathfinding. Moves one tile closer each turn."""
 
@@ -141,7 +143,7 @@ class SporeMoveToAction(Action):
     type: str = "SPORE_MOVE_TO"
 
 
-@dataclass
+@dataclass(slots=True)
 class SporeCreateSpawnerAction(Action):
     """Create a spawner using part of the spore's biomass at its current position. Cost follows exponential sequence: 0, 1, 3, 7, 15, 31..."""
 
@@ -150,7 +152,7 @@ class SporeCreateSpawnerAction(Action):
     type: str = "SPORE_CREATE_SPAWNER"
 
 
-@dataclass
+@dataclass(slots=True)
 class SpawnerProduceSporeAction(Action):
     """Create a new spore at the spawner location with specified biomass. Costs nutrients equal to biomass."""
 
@@ -161,7 +163,7 @@ class SpawnerProduceSporeAction(Action):
     type: str = "SPAWNER_PRODUCE_SPORE"
 
 
-@dataclass
+@dataclass(slots=True)
 class SporeSplitAction(Action):
     """Split a spore into two spores, distributing biomass between them. Original spore moves with specified biomass, new spore created at original position with remaining biomass."""
 